@@ -1,20 +1,135 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import json
 import glob
+import hashlib
 import os
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None
+
+try:
+    import json_stream
+except ImportError:  # json_stream is optional; only used for very large faction files
+    json_stream = None
+
+# Define the columns we expect (Prevent KeyError if no data found)
+EXPECTED_COLS = [
+    "Faction", "Unit Name", "Role", "Org Slot", "Points", "Troop Type", 
+    "Innate Rules", "Default Equipment", "Optional Upgrades",
+    "M", "WS", "BS", "S", "T", "W", "I", "A", "Ld"
+]
+
+# Low-cardinality label columns, stored as pandas categoricals
+CATEGORY_COLS = ["Faction", "Role", "Org Slot", "Troop Type"]
+
+CACHE_DIR = ".cache"
+
+# Files above this size are streamed unit by unit; below it, a one-shot parse is faster
+STREAM_MIN_BYTES = 1 << 20
+
+def _source_signature(json_files):
+    """sha1 over the source files' paths and mtimes (and this loader's own)."""
+    sources = sorted(json_files) + [os.path.abspath(__file__)]
+    return hashlib.sha1(repr([(f, os.path.getmtime(f)) for f in sources]).encode()).hexdigest()
+
+def _cache_path(root_dir, sig):
+    """Parquet cache location for a given source signature."""
+    return os.path.join(root_dir, CACHE_DIR, f"{sig}.parquet")
+
+def _with_version(df, sig):
+    # Callers key their own caches on this: it changes whenever any source file does
+    df.attrs["data_version"] = sig
+    return df
+
+def _write_cache(df, cache_path):
+    cache_dir = os.path.dirname(cache_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Drop stale snapshots from older data before writing the new one
+    for old in glob.glob(os.path.join(cache_dir, "*.parquet")):
+        os.remove(old)
+    df.to_parquet(cache_path, compression="zstd")
+
+def _load_faction_file(j_file):
+    """Parse one faction file into row tuples (one per model), or None on failure."""
+    try:
+        with open(j_file, 'rb') as f:
+            if json_stream is not None and os.path.getsize(j_file) > STREAM_MIN_BYTES:
+                # Large file: walk the units one at a time instead of holding the whole parsed tree
+                # The stream is forward-only, so take keys in whatever order the file has them
+                data = json_stream.load(f, persistent=False)
+                faction, have_faction, units = "Unknown", False, []
+                for key, value in data.items():
+                    if key == "faction_name":
+                        faction, have_faction = value, True
+                    elif key == "units":
+                        units = (json_stream.to_standard_types(u) for u in value)
+                        if have_faction:
+                            return _build_rows(faction, units)
+                        # Units came before the faction name: hold them until it turns up
+                        units = list(units)
+                return _build_rows(faction, units)
+
+            data = orjson.loads(f.read()) if orjson is not None else json.loads(f.read())
+        return _build_rows(data.get("faction_name", "Unknown"), data.get("units", []))
+    except Exception as e:
+        print(f"Error loading {j_file}: {e}")
+        return None
+
+def _build_rows(faction, units):
+    """Expand a faction's units into row tuples, one per model."""
+    rows = []
+
+    for unit in units:
+        # Unit-level values are shared by every model in the unit, so work them out once
+        upgrades_list = unit.get("upgrades", [])
+        optional_upgrades_str = ", ".join(u['name'] for u in upgrades_list if not u.get('is_default'))
+        unit_defaults = tuple(u['name'] for u in upgrades_list if u.get('is_default'))
+        unit_rules = tuple(unit.get("rules", ()))
+        unit_base_points = unit.get("base_points", 0)
+        unit_category = unit.get("category", "Special")
+        
+        for model in unit.get("models", []):
+            # Bind the lookups once; they're called ~20 times per row
+            model_get = model.get
+            stats_get = model_get("stats", {}).get
+            
+            point_cost = model_get("cost", 0)
+            if point_cost == 0:
+                point_cost = unit_base_points
+
+            combined_rules = sorted({*unit_rules, *model_get("rules", ())})
+            full_loadout = sorted({*model_get("default_weapons", ()), *unit_defaults})
+
+            # Tuples in EXPECTED_COLS order: no per-row key hashing when the frame is built
+            rows.append((
+                faction,
+                model_get("name"),
+                model_get("role", "rank_and_file"),
+                unit_category,
+                point_cost,
+                stats_get("Type", "Unknown"),
+                ", ".join(combined_rules),
+                ", ".join(full_loadout),
+                optional_upgrades_str,
+                stats_get("M", "-"),
+                stats_get("WS", "-"),
+                stats_get("BS", "-"),
+                stats_get("S", "-"),
+                stats_get("T", "-"),
+                stats_get("W", "-"),
+                stats_get("I", "-"),
+                stats_get("A", "-"),
+                stats_get("LD") or stats_get("Ld", "-"),
+            ))
+
+    return rows
+
 @st.cache_data
 def load_all_data(folder_path):
-    # Define the columns we expect (Prevent KeyError if no data found)
-    expected_cols = [
-        "Faction", "Unit Name", "Role", "Org Slot", "Points", "Troop Type", 
-        "Innate Rules", "Special Rules", "Default Equipment", "Optional Upgrades",
-        "M", "WS", "BS", "S", "T", "W", "I", "A", "Ld"
-    ]
-    
-    all_rows = []
-    
     # Construct absolute path to ensure we find the folder relative to this script
     # This helps if main.py is running from a different working directory
     base_dir = os.path.dirname(os.path.abspath(__file__)) # backend/
@@ -32,62 +147,68 @@ def load_all_data(folder_path):
         if os.path.exists(folder_path):
              json_files = glob.glob(os.path.join(folder_path, "*.json"))
 
+    sig = _source_signature(json_files)
     if not json_files:
-        return pd.DataFrame(columns=expected_cols)
+        return _with_version(pd.DataFrame(columns=EXPECTED_COLS).astype({c: "category" for c in CATEGORY_COLS}), sig)
 
-    for j_file in json_files:
+    # Disk cache: skip JSON parsing entirely across restarts if nothing changed
+    cache_path = _cache_path(root_dir, sig)
+    if os.path.exists(cache_path):
         try:
-            with open(j_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            faction = data.get("faction_name", "Unknown")
-            
-            for unit in data.get("units", []):
-                optional_upgrades = [u['name'] for u in unit.get("upgrades", []) if not u.get('is_default')]
-                
-                for model in unit.get("models", []):
-                    stats = model.get("stats", {})
-                    
-                    point_cost = model.get("cost", 0)
-                    if point_cost == 0:
-                        point_cost = unit.get("base_points", 0)
-
-                    combined_rules = sorted(list(set(unit.get("rules", []) + model.get("rules", []))))
-                    model_weapons = model.get("default_weapons", [])
-                    unit_defaults = [u['name'] for u in unit.get("upgrades", []) if u.get('is_default')]
-                    full_loadout = sorted(list(set(model_weapons + unit_defaults)))
-
-                    all_rows.append({
-                        "Faction": faction,
-                        "Unit Name": model.get("name"),
-                        "Role": model.get("role", "rank_and_file"),
-                        "Org Slot": unit.get("category", "Special"),
-                        "Points": point_cost,
-                        "Troop Type": stats.get("Type", "Unknown"),
-                        "Innate Rules": ", ".join(combined_rules),
-                        "Special Rules": combined_rules,
-                        "Default Equipment": ", ".join(full_loadout),
-                        "Optional Upgrades": ", ".join(optional_upgrades),
-                        "M": stats.get("M", "-"), 
-                        "WS": stats.get("WS", "-"), 
-                        "BS": stats.get("BS", "-"),
-                        "S": stats.get("S", "-"), 
-                        "T": stats.get("T", "-"), 
-                        "W": stats.get("W", "-"),
-                        "I": stats.get("I", "-"), 
-                        "A": stats.get("A", "-"), 
-                        "Ld": stats.get("LD") or stats.get("Ld", "-")
-                    })
+            return _with_version(pd.read_parquet(cache_path), sig)
         except Exception as e:
-            print(f"Error loading {j_file}: {e}")
+            print(f"Error reading cache {cache_path}: {e}")
+
+    all_rows = []
+    for j_file in json_files:
+        rows = _load_faction_file(j_file)
+        if rows is not None:
+            all_rows.extend(rows)
 
     if not all_rows:
-        return pd.DataFrame(columns=expected_cols)
+        return _with_version(pd.DataFrame(columns=EXPECTED_COLS).astype({c: "category" for c in CATEGORY_COLS}), sig)
 
-    df = pd.DataFrame(all_rows)
+    df = pd.DataFrame.from_records(all_rows, columns=EXPECTED_COLS)
     
     numeric_cols = ["Points", "M", "WS", "BS", "S", "T", "W", "I", "A", "Ld"]
+    # Extract the first run of digits from every stat in one regex pass (columns stacked end to end),
+    # then slice each column back out
+    n = len(df)
+    digits = pd.concat([df[col].astype(str) for col in numeric_cols], ignore_index=True).str.extract(r'(\d+)', expand=False)
+    for i, col in enumerate(numeric_cols):
+        df[col] = pd.to_numeric(digits.iloc[i * n:(i + 1) * n], errors='coerce').fillna(0).to_numpy()
+
+    # Champion / Character Name Formatting
+    is_champ = df['Role'].eq('champion')
+    is_generic = df['Unit Name'].str.lower().eq('champion')
+    df['Unit Name'] = np.where(is_champ & ~is_generic, "Champion - " + df['Unit Name'],
+                               np.where(is_champ, "Champion", df['Unit Name']))
+
+    # Search text for the sidebar term filter, built once here rather than per rerun
+    # (joined with a separator so a term can't match across column boundaries)
+    df["_search_blob"] = (df['Innate Rules'].fillna('') + "\x1f" +
+                          df['Default Equipment'].fillna('') + "\x1f" +
+                          df['Optional Upgrades'].fillna(''))
+
+    # Narrow dtypes: the label columns only hold a few dozen distinct values, and stats/points are
+    # small integers, so category codes and the smallest integer type that fits cut memory
+    for col in CATEGORY_COLS:
+        df[col] = df[col].astype("category")
+    # Faction/Org Slot are the sort keys; marking them ordered records that their (lexical) category
+    # order is meaningful, so comparisons and min/max work. Sorting uses the codes either way
+    for col in ("Faction", "Org Slot"):
+        df[col] = df[col].cat.as_ordered()
+    # downcast picks the width from each column's actual range, so an out-of-range value widens
+    # the column instead of silently wrapping (a blind astype("int8") turns 200 into -56)
     for col in numeric_cols:
-        df[col] = pd.to_numeric(df[col].astype(str).str.extract(r'(\d+)')[0], errors='coerce').fillna(0)
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+
+    # Sort once here so callers never need to: boolean-mask filtering preserves this order
+    df = df.sort_values(["Faction", "Org Slot", "Unit Name"]).reset_index(drop=True)
+
+    try:
+        _write_cache(df, cache_path)
+    except Exception as e:
+        print(f"Error writing cache {cache_path}: {e}")
     
-    return df
\ No newline at end of file
+    return _with_version(df, sig)
\ No newline at end of file
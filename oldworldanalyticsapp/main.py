@@ -4,6 +4,7 @@ import pandas as pd
 import numpy as np
 import json
 import os
+import re
 from backend.data_loader import load_all_data
 
 # --- Page Config ---
@@ -17,18 +18,23 @@ st.set_page_config(
 DATA_FOLDER = "tow_data_json" 
 df = load_all_data(DATA_FOLDER)
 
+@st.cache_data
+def load_reference_db(path, mtime):
+    """Parse a reference price file once per process. `mtime` only feeds the cache key,
+    so editing the file on disk invalidates the cached copy."""
+    with open(path, "r") as f:
+        return json.load(f)
+
 # A. Load Equipment (Critical)
 try:
-    with open("equipment_values.json", "r") as f:
-        EQUIPMENT_DB = json.load(f)
+    EQUIPMENT_DB = load_reference_db("equipment_values.json", os.path.getmtime("equipment_values.json"))
 except FileNotFoundError:
     EQUIPMENT_DB = {"rank_and_file": {}, "character": {}}
     st.error("⚠️ 'equipment_values.json' not found. Gear valuation will be skipped.")
 
 # B. Load Rules (Optional / Future)
 try:
-    with open("rules.json", "r") as f:
-        RULES_DB = json.load(f)
+    RULES_DB = load_reference_db("rules.json", os.path.getmtime("rules.json"))
 except FileNotFoundError:
     RULES_DB = {"rank_and_file": {}, "character": {}}
     # Non-fatal warning in sidebar
@@ -36,55 +42,81 @@ except FileNotFoundError:
 
 # --- 2. Logic: Split Valuation (Robust) ---
 
-def calculate_split_values(row):
+# Gear phrases that contain a priced key without being that item ("Throwing Spear" is not a
+# "Spear", an "Elbow" is not a "Bow"). Ones missing from the DB still need to be matched, unpriced,
+# so longest-first matching swallows them instead of pricing the shorter key inside.
+NON_ITEM_PHRASES = ("crossbow", "longbow", "shortbow", "elbow", "throwing spear", "cavalry spear")
+
+def build_price_matcher(prices, unpriced=()):
     """
-    Returns a tuple (gear_value, rules_value).
-    Uses robust 'Reverse Lookup' to find items inside text strings.
+    Compiles a price table into (pattern, lookup): one regex alternating every key, longest first,
+    so a single left-to-right scan finds the longest known item at each position.
+    Longest-match is what stops double counting ("Crossbow" is never also a "Bow").
+    `unpriced` phrases join the alternation with a None price unless they are keys themselves.
     """
-    role = "character" if row["Org Slot"] == "Characters" else "rank_and_file"
-    
-    # Get the specific lookup tables for this role
+    lookup = {k.lower(): price for k, price in prices.items()}
+    if not lookup:
+        return None, lookup
+    # e.g. "throwing spear, shield, elbow" -> throwing spear (None), shield (1.0), elbow (None)
+    for phrase in unpriced:
+        lookup.setdefault(phrase, None)
+    alternation = "|".join(re.escape(k) for k in sorted(lookup, key=len, reverse=True))
+    return re.compile(alternation), lookup
+
+def role_prices(db, role):
     # We default to 'rank_and_file' if key missing to be safe
-    equip_prices = EQUIPMENT_DB.get(role, EQUIPMENT_DB.get("rank_and_file", {}))
-    rule_prices = RULES_DB.get(role, RULES_DB.get("rank_and_file", {}))
+    return db.get(role, db.get("rank_and_file", {}))
+
+@st.cache_resource
+def get_matchers(equip_db_id, rules_db_id):
+    """
+    All four compiled matchers (equipment/rules x character/rank_and_file), shared across reruns
+    and sessions. The ids are content hashes of the DBs: they only key the cache, so an edited
+    JSON file gets fresh matchers.
+    """
+    return {
+        role: {"equip": build_price_matcher(role_prices(EQUIPMENT_DB, role), NON_ITEM_PHRASES),
+               "rules": build_price_matcher(role_prices(RULES_DB, role))}
+        for role in ("character", "rank_and_file")
+    }
+
+PRICE_MATCHERS = get_matchers(hash(json.dumps(EQUIPMENT_DB, sort_keys=True)),
+                              hash(json.dumps(RULES_DB, sort_keys=True)))
+
+def matched_value(texts, matcher):
+    """Total price of the distinct DB keys found in each (lowercase) text."""
+    pattern, lookup = matcher
+    if pattern is None:
+        return np.zeros(len(texts))
+    return texts.str.findall(pattern).map(
+        lambda found: sum(lookup[m] for m in set(found) if lookup[m] is not None)
+    ).to_numpy(dtype=np.float64)
+
+def item_price(item, matcher):
+    """Price of the first priced DB key found in a single item/rule name, or None."""
+    pattern, lookup = matcher
+    if pattern is None:
+        return None
+    return next((lookup[m] for m in pattern.findall(item.lower()) if lookup[m] is not None), None)
+
+def calculate_split_values(frame):
+    """
+    Returns a tuple of arrays (gear_value, rules_value), one entry per row of `frame`.
+    Uses robust 'Reverse Lookup' to find items inside text strings: one regex scan per row.
+    """
+    # Normalize the loadout / rules strings to lowercase once for searching
+    loadout_lc = frame['Default Equipment'].fillna('').str.lower()
+    rules_lc = frame['Innate Rules'].fillna('').str.lower()
+    is_char = frame["Org Slot"].eq("Characters").to_numpy()
     
-    g_val = 0.0
-    r_val = 0.0
+    g_val = np.zeros(len(frame))
+    r_val = np.zeros(len(frame))
     
-    # 1. Calculate Equipment Value (Robust Scan)
-    if row['Default Equipment']:
-        # Normalize the unit's loadout string to lowercase for searching
-        loadout_str = row['Default Equipment'].lower()
-        
-        # Iterate through every known item in our database
-        for item_key, price in equip_prices.items():
-            item_lower = item_key.lower()
-            
-            # Check if this item exists in the loadout string
-            if item_lower in loadout_str:
-                
-                # --- Safeguards against Double Counting ---
-                # 1. Don't count "Bow" if it's actually "Crossbow" or "Longbow"
-                if item_lower == "bow":
-                    if any(x in loadout_str for x in ["crossbow", "longbow", "shortbow", "elbow"]):
-                        continue
-                
-                # 2. Don't count "Spear" if it's "Throwing Spear"
-                if item_lower == "spear":
-                    if any(x in loadout_str for x in ["throwing spear", "cavalry spear"]):
-                        continue
-                        
-                # 3. Don't count "Armour" if "Heavy Armour" etc. (Though usually DB has full names)
-                # (Add more exclusions here if you find other overlaps)
-                
-                g_val += price
-
-    # 2. Calculate Rules Value (Standard Scan)
-    if row['Innate Rules']:
-        rules_str = row['Innate Rules'].lower()
-        for rule_key, price in rule_prices.items():
-            if rule_key.lower() in rules_str:
-                r_val += price
+    for role, in_role in (("character", is_char), ("rank_and_file", ~is_char)):
+        if not in_role.any():
+            continue
+        g_val[in_role] = matched_value(loadout_lc[in_role], PRICE_MATCHERS[role]["equip"])
+        r_val[in_role] = matched_value(rules_lc[in_role], PRICE_MATCHERS[role]["rules"])
                 
     return g_val, r_val
 
@@ -92,25 +124,62 @@ def calculate_split_values(row):
 if "saved_units" not in st.session_state:
     st.session_state["saved_units"] = set()
 
-# Champion / Character Name Formatting
-if 'Role' in df.columns:
-    def format_name(row):
-        if row['Role'] == 'champion':
-            if row['Unit Name'].lower() == "champion": return "Champion"
-            return f"Champion - {row['Unit Name']}"
-        return row['Unit Name']
-    df['Unit Name'] = df.apply(format_name, axis=1)
+# Stable integer key for saved-list membership (Faction + Unit Name repeats, e.g. generic "Champion").
+# df is presorted with a RangeIndex, so it's also the row label
+df["unit_id"] = np.arange(len(df), dtype=np.int32)
 
-# Generate Unique ID
-df["unique_id"] = df["Faction"] + " - " + df["Unit Name"]
+@st.cache_data
+def compute_value_columns(_frame, data_version, equipment_db, rules_db):
+    """
+    Free gear / rules value and the resulting 'naked' cost per unit. None of this depends on the
+    sliders, so it is computed once per data version. `data_version` and the two DBs only feed
+    the cache key (the DBs are what the price matchers were built from).
+    """
+    gear, rules = calculate_split_values(_frame)
+    extra = gear + rules
+    return pd.DataFrame({
+        "Gear_Value": gear,
+        "Rules_Value": rules,
+        "Extra_Value": extra,
+        "Naked_Points": np.maximum(_frame["Points"].to_numpy(dtype=np.float64) - extra, 1.0),
+    }, index=_frame.index, dtype=np.float32)  # plenty of precision for point values
+
+def priced_items(texts, matcher, sep=","):
+    """Per row: sorted (item, price-or-None) pairs for a comma-separated item string."""
+    return texts.fillna('').map(
+        lambda t: tuple((item, item_price(item, matcher)) for item in sorted(x.strip() for x in t.split(sep) if x.strip()))
+    )
+
+@st.cache_data
+def compute_card_items(_frame, data_version, equipment_db, rules_db):
+    """
+    The unit card's item lists, split, sorted and priced once per data version so the dialog
+    only formats them. Object columns of tuples; upgrades are listed unpriced.
+    """
+    is_char = _frame["Org Slot"].eq("Characters").to_numpy()
+    equip = pd.Series(index=_frame.index, dtype=object)
+    rules = pd.Series(index=_frame.index, dtype=object)
+    for role, in_role in (("character", is_char), ("rank_and_file", ~is_char)):
+        if not in_role.any():
+            continue
+        equip[in_role] = priced_items(_frame.loc[in_role, 'Default Equipment'], PRICE_MATCHERS[role]["equip"])
+        rules[in_role] = priced_items(_frame.loc[in_role, 'Innate Rules'], PRICE_MATCHERS[role]["rules"])
+    upgrades = _frame['Optional Upgrades'].fillna('').map(
+        lambda t: tuple(sorted(x.strip() for x in t.split(", ") if x.strip()))
+    )
+    return pd.DataFrame({"_equip_items": equip, "_rules_items": rules, "_upgrade_items": upgrades})
+
+# Content signature of the loaded source files; the cached helpers below take their frame unhashed
+# and join results back by position, so this token must change whenever the data does
+DATA_VERSION = df.attrs["data_version"]
+df = df.join(compute_value_columns(df, DATA_VERSION, EQUIPMENT_DB, RULES_DB))
+df = df.join(compute_card_items(df, DATA_VERSION, EQUIPMENT_DB, RULES_DB))
 
 # --- 4. Unit Card Dialog ---
 @st.dialog("Unit Profile", width="large")
 def show_unit_card(row):
-    # Calculate values on the fly
-    g_val, r_val = calculate_split_values(row)
-    total_extras = g_val + r_val
-    naked_cost = max(row['Points'] - total_extras, 1.0)
+    g_val, r_val = row['Gear_Value'], row['Rules_Value']
+    naked_cost = row['Naked_Points']
     
     col_h1, col_h2 = st.columns([3, 2])
     with col_h1:
@@ -143,59 +212,42 @@ def show_unit_card(row):
 
     tab_rules, tab_gear, tab_math = st.tabs(["📜 Rules & Gear", "💰 Options", "🧮 Math"])
 
-    role_key = "character" if row["Org Slot"] == "Characters" else "rank_and_file"
-    # Safe getters for prices (Robust lookup for display too)
-    e_prices = EQUIPMENT_DB.get(role_key, {})
-    r_prices = RULES_DB.get(role_key, {})
-
+    # Item lists come presplit, sorted and priced from compute_card_items; this only formats them
     with tab_rules:
         c1, c2 = st.columns(2)
         with c1:
             st.markdown("#### ⚔️ Equipment")
-            if row['Default Equipment']:
-                # We simply list what is in the string, but try to bold items we found value for
-                items = sorted([x.strip() for x in row['Default Equipment'].split(",") if x.strip()])
-                for item in items:
-                    # check if this specific item triggered a value
-                    val_str = ""
-                    for db_k, db_p in e_prices.items():
-                        if db_k.lower() in item.lower():
-                            # Safeguard check again for display
-                            if db_k.lower() == "bow" and any(x in item.lower() for x in ["crossbow", "longbow"]):
-                                continue
-                            val_str = f" `({db_p} pts)`"
-                            break
+            if row['_equip_items']:
+                # Items we found a DB value for get their price alongside
+                for item, price in row['_equip_items']:
+                    val_str = f" `({price} pts)`" if price is not None else ""
                     st.markdown(f"- {item}{val_str}")
             else:
                 st.caption("None")
 
         with c2:
             st.markdown("#### 📜 Special Rules")
-            if row['Innate Rules']:
-                rules = sorted([x.strip() for x in row['Innate Rules'].split(",") if x.strip()])
-                for rule in rules:
-                    val_str = ""
-                    for db_k, db_p in r_prices.items():
-                        if db_k.lower() in rule.lower():
-                            val_str = f" `({db_p} pts)`"
-                            break
+            if row['_rules_items']:
+                for rule, price in row['_rules_items']:
+                    val_str = f" `({price} pts)`" if price is not None else ""
                     st.markdown(f"- {rule}{val_str}")
             else:
                 st.caption("None")
 
     with tab_gear:
         st.markdown("#### Available Upgrades")
-        if row['Optional Upgrades']:
-            upgrades = sorted([x.strip() for x in row['Optional Upgrades'].split(", ") if x.strip()])
-            for up in upgrades:
+        if row['_upgrade_items']:
+            for up in row['_upgrade_items']:
                 st.markdown(f"- {up}")
         else:
             st.caption("No upgrades listed.")
 
     with tab_math:
         st.write("Combat Efficiency Score:")
-        offense = (row['A'] * row['WS']) + (row['S'] * 1.5)
-        defense = (row['T'] * 1.5) + (row['W'] * 2)
+        # Stats are stored as narrow ints; do the maths in float so products can't overflow
+        a, ws, s, t, w = (float(row[c]) for c in ("A", "WS", "S", "T", "W"))
+        offense = (a * ws) + (s * 1.5)
+        defense = (t * 1.5) + (w * 2)
         st.progress(min(int(offense + defense), 100))
         st.markdown(f"**True Efficiency (Stats per Naked Point):** {((offense+defense)/naked_cost):.2f}")
 
@@ -203,10 +255,35 @@ def show_unit_card(row):
 st.sidebar.title("⚔️ Data Filters")
 # Faction Logic
 RENEGADE_KEYWORDS = ["chaos dwarf", "daemon", "demon", "chaos", "dark elf", "lizard", "ogre", "skaven", "vampire"]
-def is_renegade(faction_name): return any(k in str(faction_name).lower() for k in RENEGADE_KEYWORDS)
-all_factions = sorted(df["Faction"].unique())
-renegade_factions = [f for f in all_factions if is_renegade(f)]
-official_factions = [f for f in all_factions if not is_renegade(f)]
+_RENEGADE_RE = re.compile("|".join(map(re.escape, RENEGADE_KEYWORDS)), re.IGNORECASE)
+
+@st.cache_data
+def build_sidebar_index(_df, data_version):
+    """Option lists for the sidebar filters. These only depend on the loaded data, so they are
+    built once per data load (keyed on `data_version`) instead of on every rerun."""
+    # Categories are already the sorted distinct factions; classify those, not every row
+    factions = list(_df["Faction"].cat.categories)
+    fac_series = pd.Series(factions, dtype="string")
+    is_ren = fac_series.str.contains(_RENEGADE_RE)
+    # Both vocabularies are comma-joined strings; split/explode them in pandas rather than a Python loop
+    all_rules = set(_df['Innate Rules'].str.split(", ").explode().dropna().unique())
+    all_options = set()
+    if 'Optional Upgrades' in _df.columns:
+        all_options = set(_df['Optional Upgrades'].dropna().astype(str).str.split(", ").explode().unique())
+    return {
+        "factions": factions,
+        "renegades": fac_series[is_ren].tolist(),
+        "official": fac_series[~is_ren].tolist(),
+        "slots": list(_df["Org Slot"].cat.categories),
+        "types": list(_df["Troop Type"].cat.categories),
+        # Units with no rules/upgrades explode to '', which would match every row as a search term
+        "search_terms": sorted(all_rules.union(all_options) - {''}),
+    }
+
+sidebar_index = build_sidebar_index(df, DATA_VERSION)
+all_factions = sidebar_index["factions"]
+renegade_factions = sidebar_index["renegades"]
+official_factions = sidebar_index["official"]
 
 def select_official(): st.session_state["faction_select"] = official_factions
 def select_renegades(): st.session_state["faction_select"] = renegade_factions
@@ -218,18 +295,9 @@ col_p2.button("Renegades", on_click=select_renegades, use_container_width=True)
 st.sidebar.button("Clear Factions", on_click=clear_all, use_container_width=True)
 
 selected_factions = st.sidebar.multiselect("Factions", all_factions, key="faction_select")
-all_slots = sorted(df["Org Slot"].astype(str).unique())
-selected_slots = st.sidebar.multiselect("Organization Slot", all_slots)
-all_types = sorted(df["Troop Type"].astype(str).unique())
-selected_types = st.sidebar.multiselect("Troop Type", all_types)
-
-all_rules = set(df['Special Rules'].explode().dropna().unique())
-all_options = set()
-if 'Optional Upgrades' in df.columns:
-    opt_series = df['Optional Upgrades'].dropna().astype(str)
-    for x in opt_series: all_options.update(x.split(", "))
-search_terms = sorted(list(all_rules.union(all_options)))
-selected_terms = st.sidebar.multiselect("Search Rules/Gear", search_terms)
+selected_slots = st.sidebar.multiselect("Organization Slot", sidebar_index["slots"])
+selected_types = st.sidebar.multiselect("Troop Type", sidebar_index["types"])
+selected_terms = st.sidebar.multiselect("Search Rules/Gear", sidebar_index["search_terms"])
 
 st.sidebar.markdown("---")
 show_champs = st.sidebar.checkbox("Show Unit Champions", value=False)
@@ -242,27 +310,43 @@ if st.sidebar.button("🗑️ Clear Saved List"):
     st.rerun()
 
 # --- 6. Apply Filtering ---
-filtered_df = df.copy()
+# Build one combined mask and slice once, rather than copying the frame for every active filter
+mask = np.ones(len(df), dtype=bool)
+unit_ids = df["unit_id"].to_numpy()
+saved_arr = np.fromiter(st.session_state["saved_units"], dtype=np.int32)
 
 if list_mode == "Saved List Only":
-    filtered_df = filtered_df[filtered_df["unique_id"].isin(st.session_state["saved_units"])]
+    mask &= np.isin(unit_ids, saved_arr, assume_unique=True)
 elif list_mode == "Exclude Saved List":
-    filtered_df = filtered_df[~filtered_df["unique_id"].isin(st.session_state["saved_units"])]
+    mask &= ~np.isin(unit_ids, saved_arr, assume_unique=True)
 
 if not show_champs:
-    filtered_df = filtered_df[filtered_df['Role'] != 'champion']
+    mask &= (df['Role'] != 'champion').to_numpy()
 
-if selected_factions: filtered_df = filtered_df[filtered_df["Faction"].isin(selected_factions)]
-if selected_slots: filtered_df = filtered_df[filtered_df["Org Slot"].isin(selected_slots)]
-if selected_types: filtered_df = filtered_df[filtered_df["Troop Type"].isin(selected_types)]
+if selected_factions: mask &= df["Faction"].isin(selected_factions).to_numpy()
+if selected_slots: mask &= df["Org Slot"].isin(selected_slots).to_numpy()
+if selected_types: mask &= df["Troop Type"].isin(selected_types).to_numpy()
 if selected_terms:
-    mask = filtered_df.apply(lambda row: any(term in str(row['Innate Rules']) or 
-                                             term in str(row['Default Equipment']) or 
-                                             term in str(row['Optional Upgrades']) 
-                                             for term in selected_terms), axis=1)
-    filtered_df = filtered_df[mask]
-
-filtered_df = filtered_df.sort_values(["Faction", "Org Slot", "Unit Name"])
+    # Text search is the expensive predicate, so only run it on rows that survived the filters above.
+    # One regex pass over the precomputed rules/equipment/upgrades blob. Case-sensitive: the terms
+    # come verbatim from the data, and "Bow" must not pick up every Crossbow/Longbow
+    term_pattern = "|".join(re.escape(t) for t in selected_terms)
+    mask[mask] = df.loc[mask, '_search_blob'].str.contains(term_pattern, regex=True, na=False).to_numpy()
+
+# df comes presorted by Faction / Org Slot / Unit Name from load_all_data, and masking keeps that order
+filtered_df = df.loc[mask]
+
+# Bounded: every filter/axis combo from every session is a new key, and each figure is ~150 KB
+@st.cache_data(max_entries=32)
+def scatter_figure(_frame, mask_key, x_ax, y_ax, data_version):
+    """
+    Efficiency scatter for the rows selected by `mask_key` (the chart mask's raw bytes).
+    Cached per (rows, axes, data version) so reruns from unrelated widgets reuse the figure.
+    """
+    chart_mask = np.frombuffer(mask_key, dtype=bool)
+    chart_df = _frame.loc[chart_mask, ["Faction", "Unit Name", "Troop Type", "Innate Rules", "W", x_ax, y_ax]]
+    chart_df = chart_df.loc[:, ~chart_df.columns.duplicated()]
+    return px.scatter(chart_df, x=x_ax, y=y_ax, color="Faction", hover_name="Unit Name", hover_data=["Troop Type", "Innate Rules"], size="W", template="plotly_dark")
 
 # --- 7. Main UI ---
 st.title("🛡️ Warhammer: The Old World - Analytics")
@@ -276,11 +360,13 @@ else:
         st.header("Unit Roster")
         st.caption(f"Showing **{len(filtered_df)}** units.")
         display_cols = ["Faction", "Unit Name", "Org Slot", "Points", "Troop Type", "M", "WS", "BS", "S", "T", "W", "I", "A", "Ld"]
-        event = st.dataframe(filtered_df[display_cols], use_container_width=True, hide_index=True, height=600, on_select="rerun", selection_mode="multi-row")
+        # Project straight from df so only the displayed columns are materialised and sent
+        display_view = df.loc[mask, display_cols]
+        event = st.dataframe(display_view, use_container_width=True, hide_index=True, height=600, on_select="rerun", selection_mode="multi-row")
         
         selected_indices = event.selection.rows
         if selected_indices:
-            selected_ids = filtered_df.iloc[selected_indices]["unique_id"].tolist()
+            selected_ids = filtered_df.iloc[selected_indices]["unit_id"].tolist()
             last_selected_row = filtered_df.iloc[selected_indices[-1]] 
             st.markdown("#### ⚡ Selection Actions")
             b1, b2, b3, b4 = st.columns(4)
@@ -302,14 +388,14 @@ else:
 
     with tab2:
         st.header("Efficiency Comparison")
-        chart_df = filtered_df
+        chart_mask = mask
         if list_mode != "Saved List Only" and len(st.session_state["saved_units"]) > 0:
             if st.checkbox("Show only My Saved List in Chart", value=False):
-                chart_df = df[df["unique_id"].isin(st.session_state["saved_units"])]
+                chart_mask = np.isin(unit_ids, saved_arr, assume_unique=True)
         c1, c2 = st.columns(2)
         with c1: x_ax = st.selectbox("X Axis", ["Points", "W", "T", "S", "M"], index=0)
         with c2: y_ax = st.selectbox("Y Axis", ["Points", "W", "T", "S", "A", "WS", "I"], index=5)
-        fig = px.scatter(chart_df, x=x_ax, y=y_ax, color="Faction", hover_name="Unit Name", hover_data=["Troop Type", "Innate Rules"], size="W", template="plotly_dark")
+        fig = scatter_figure(df, chart_mask.tobytes(), x_ax, y_ax, DATA_VERSION)
         st.plotly_chart(fig, use_container_width=True)
 
     with tab3:
@@ -323,28 +409,27 @@ else:
             w_w = st.slider("W", 1.0, 5.0, 3.0)
             
             # --- CALCULATIONS ---
-            def calc_total_extras(row):
-                g, r = calculate_split_values(row)
-                return g + r
-                
-            filtered_df["Extra_Value"] = filtered_df.apply(calc_total_extras, axis=1)
-            filtered_df["Naked_Points"] = filtered_df["Points"] - filtered_df["Extra_Value"]
-            filtered_df["Naked_Points"] = filtered_df["Naked_Points"].apply(lambda x: max(x, 1.0))
+            # Extra_Value / Naked_Points are precomputed; only the weighted stat sum depends on the sliders.
+            # Weighted stat sum as one matrix-vector product over the stat block: a single fused pass,
+            # no per-term temporaries
+            stat_block = filtered_df[["WS", "S", "T", "W", "A"]].to_numpy(dtype=np.float32)
+            tcv = stat_block @ np.array([w_ws, w_s, w_t, w_w, 2.0], dtype=np.float32)
             
-            filtered_df["TCV"] = ((filtered_df["WS"] * w_ws) + (filtered_df["S"] * w_s) + (filtered_df["T"] * w_t) + (filtered_df["W"] * w_w) + (filtered_df["A"] * 2.0))
-            filtered_df["True_Efficiency"] = (filtered_df["TCV"] / filtered_df["Naked_Points"])
+            # Tab-local frame with just the columns the chart/table use; filtered_df itself stays read-only
+            value_df = filtered_df[["Unit Name", "Faction", "Points", "Extra_Value", "Naked_Points"]].assign(
+                TCV=tcv, True_Efficiency=tcv / filtered_df["Naked_Points"].to_numpy())
 
         with col_c:
             st.markdown("#### 💎 True Efficiency Scatter")
             st.caption("Y-Axis: **Stats per Naked Point**. Higher is better.")
             
             fig_val = px.scatter(
-                filtered_df, x="Points", y="True_Efficiency", color="Faction", size="Extra_Value",
+                value_df, x="Points", y="True_Efficiency", color="Faction", size="Extra_Value",
                 hover_name="Unit Name", hover_data=["Extra_Value", "Naked_Points"],
                 template="plotly_dark", height=600
             )
             st.plotly_chart(fig_val, use_container_width=True)
             
         st.markdown("#### 🏆 Top 'Freebie' Units")
-        top_freebies = filtered_df[["Unit Name", "Faction", "Points", "Extra_Value", "Naked_Points"]].sort_values("Extra_Value", ascending=False).head(10)
+        top_freebies = value_df[["Unit Name", "Faction", "Points", "Extra_Value", "Naked_Points"]].sort_values("Extra_Value", ascending=False).head(10)
         st.dataframe(top_freebies, hide_index=True, use_container_width=True)
\ No newline at end of file